@@ -0,0 +1,130 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Defaults, overridable through environment variables
+DEFAULT_MAX_CONCURRENT = 2       # Generations running at once across all sessions
+DEFAULT_MAX_QUEUED = 6           # Requests allowed to wait for a free slot
+DEFAULT_MAX_PER_USER = 1         # In-flight (running or queued) requests per user
+DEFAULT_QUEUE_TIMEOUT = 300      # Seconds a request may wait before being shed
+DEFAULT_POLL_INTERVAL = 1.0      # Seconds between queue position updates
+
+
+class AdmissionRejected(Exception):
+    """Raised when a generation request is not admitted"""
+
+
+class AdmissionController:
+    """Global concurrency cap with a bounded FIFO wait queue and per-user limits.
+
+    One instance is shared by every Streamlit session in the server process.
+    """
+
+    def __init__(self, max_concurrent=DEFAULT_MAX_CONCURRENT, max_queued=DEFAULT_MAX_QUEUED,
+                 max_per_user=DEFAULT_MAX_PER_USER, queue_timeout=DEFAULT_QUEUE_TIMEOUT,
+                 poll_interval=DEFAULT_POLL_INTERVAL):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self.max_queued = max(0, max_queued)
+        self.max_per_user = max(1, max_per_user)
+        self.queue_timeout = queue_timeout
+        self.poll_interval = poll_interval
+
+        self._cond = threading.Condition()
+        self._active = 0
+        self._queue = deque()
+        self._per_user = {}
+
+    @classmethod
+    def from_env(cls):
+        """Build a controller from MAX_CONCURRENT_GENERATIONS and related variables"""
+        return cls(
+            max_concurrent=int(os.getenv("MAX_CONCURRENT_GENERATIONS", DEFAULT_MAX_CONCURRENT)),
+            max_queued=int(os.getenv("MAX_QUEUED_GENERATIONS", DEFAULT_MAX_QUEUED)),
+            max_per_user=int(os.getenv("MAX_GENERATIONS_PER_USER", DEFAULT_MAX_PER_USER)),
+            queue_timeout=float(os.getenv("GENERATION_QUEUE_TIMEOUT", DEFAULT_QUEUE_TIMEOUT)),
+        )
+
+    def stats(self):
+        """Return (running, queued) counts"""
+        with self._cond:
+            return self._active, len(self._queue)
+
+    @contextmanager
+    def slot(self, user_id, on_wait=None, limit=None):
+        """Hold a generation slot for the duration of the block.
+
+        ``on_wait(position)`` is called while queued, with a 1-based queue
+        position. ``limit`` overrides ``max_per_user`` for this key, e.g. for
+        an IP address shared by several people. Raises AdmissionRejected if
+        the key already has too many requests in flight, the queue is full,
+        or the wait times out.
+        """
+        self._acquire(user_id, on_wait, limit or self.max_per_user)
+        try:
+            yield
+        finally:
+            self._release(user_id)
+
+    def _acquire(self, user_id, on_wait, limit):
+        ticket = object()
+        with self._cond:
+            if self._per_user.get(user_id, 0) >= limit:
+                raise AdmissionRejected(
+                    "Too many presentations are already being generated from your account or network. "
+                    "Please wait for one to finish and try again."
+                )
+            if self._active >= self.max_concurrent and len(self._queue) >= self.max_queued:
+                raise AdmissionRejected(
+                    "The server is at capacity right now. Please try again in a few minutes."
+                )
+            self._queue.append(ticket)
+            self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+
+        deadline = time.monotonic() + self.queue_timeout
+        admitted = False
+        try:
+            while True:
+                with self._cond:
+                    if self._queue[0] is ticket and self._active < self.max_concurrent:
+                        self._queue.popleft()
+                        self._active += 1
+                        admitted = True
+                        # The next ticket may also fit under the cap
+                        self._cond.notify_all()
+                        return
+                    position = self._queue.index(ticket) + 1
+                    if time.monotonic() >= deadline:
+                        raise AdmissionRejected(
+                            "Timed out waiting in the generation queue. Please try again later."
+                        )
+
+                # Callback runs outside the lock so UI updates never block other sessions
+                if on_wait:
+                    on_wait(position)
+
+                with self._cond:
+                    self._cond.wait(timeout=self.poll_interval)
+        finally:
+            if not admitted:
+                with self._cond:
+                    if ticket in self._queue:
+                        self._queue.remove(ticket)
+                    self._drop_user(user_id)
+                    self._cond.notify_all()
+
+    def _release(self, user_id):
+        with self._cond:
+            self._active -= 1
+            self._drop_user(user_id)
+            self._cond.notify_all()
+
+    def _drop_user(self, user_id):
+        remaining = self._per_user.get(user_id, 0) - 1
+        if remaining > 0:
+            self._per_user[user_id] = remaining
+        else:
+            self._per_user.pop(user_id, None)
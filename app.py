@@ -3,19 +3,27 @@ import os
 import sys
 from pathlib import Path
 import time
+from contextlib import contextmanager
 from datetime import datetime
 import tempfile
+import threading
+import uuid
 
 # Add the current directory to the path to import your modules
 sys.path.append(str(Path(__file__).parent))
 
 # Import your existing generator classes
 try:
-    from ppt_generator import PPTGenerator
+    from ppt_generator import PPTGenerator, WARMUP_NUM_SLIDES, WARMUP_TIME_BUDGET
 except ImportError:
     st.error("⚠️ Could not import PPTGenerator module. Make sure main.py is in the same directory.")
     st.stop()
 
+from admission_control import AdmissionController, AdmissionRejected
+
+DEFAULT_MAX_PER_IP = 3  # In-flight requests per client IP, which a NAT may share between users
+WARMUP_IDLE_POLL_INTERVAL = 5  # Seconds between checks for an idle server before warming a topic
+
 # Page configuration
 st.set_page_config(
     page_title="AI PowerPoint Generator",
@@ -111,6 +119,46 @@ def display_api_status(content_apis, image_apis):
             unsafe_allow_html=True
         )
 
+@st.cache_resource
+def get_admission_controller():
+    """Single admission controller shared by all sessions in this server process"""
+    return AdmissionController.from_env()
+
+def get_client_ip():
+    """Client IP for this session.
+
+    Forwarding headers can be set by the client, so X-Forwarded-For is only
+    used when TRUSTED_PROXY_HOPS says how many proxies in front of the app
+    append to it. The entry added by the outermost trusted proxy is then the
+    client address.
+    """
+    trusted_hops = int(os.getenv('TRUSTED_PROXY_HOPS', 0))
+    if trusted_hops > 0:
+        hops = [hop.strip() for hop in st.context.headers.get('X-Forwarded-For', '').split(',') if hop.strip()]
+        if len(hops) >= trusted_hops:
+            return hops[-trusted_hops]
+    return st.context.ip_address
+
+def get_user_identity():
+    """Return (user_id, limit) for the per-user admission limit.
+
+    Prefers the signed-in account, then the client IP, which may be shared by
+    several people behind a NAT and so gets MAX_GENERATIONS_PER_IP. Falls back
+    to the session only when neither is available, in which case each tab
+    counts separately.
+    """
+    user = getattr(st, 'user', None)
+    if user is not None and getattr(user, 'is_logged_in', False) and getattr(user, 'email', None):
+        return f"user:{user.email}", None
+
+    client_ip = get_client_ip()
+    if client_ip:
+        return f"ip:{client_ip}", int(os.getenv('MAX_GENERATIONS_PER_IP', DEFAULT_MAX_PER_IP))
+
+    if 'session_id' not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+    return f"session:{st.session_state.session_id}", None
+
 def get_topic_suggestions():
     return [
         "Machine Learning Fundamentals",
@@ -135,6 +183,60 @@ def get_topic_suggestions():
         "E-commerce Evolution"
     ]
 
+def get_warmup_topics():
+    """Suggested topics plus any extra hot topics listed in WARMUP_TOPICS (comma-separated)"""
+    extra = [t.strip() for t in os.getenv('WARMUP_TOPICS', '').split(',') if t.strip()]
+    return get_topic_suggestions() + [t for t in extra if t not in get_topic_suggestions()]
+
+@contextmanager
+def warmup_slot(controller):
+    """Hold a generation slot for warm-up, but only once no user work is running or queued"""
+    while controller.stats() != (0, 0):
+        time.sleep(WARMUP_IDLE_POLL_INTERVAL)
+    with controller.slot("cache-warmup"):
+        yield
+
+def run_cache_warmup(controller, interval, time_budget, num_slides):
+    """Warm the outline and image caches once, then every `interval` seconds if set"""
+    while True:
+        try:
+            warmed = PPTGenerator().warm_up(
+                get_warmup_topics(),
+                num_slides=num_slides,
+                time_budget=time_budget,
+                slot=lambda: warmup_slot(controller),
+                # Scheduled passes regenerate outlines that have been cached for a full interval
+                refresh_age=interval if interval > 0 else None,
+            )
+            print(f"🔥 Cache warm-up finished: {warmed} topic(s) generated")
+        except Exception as e:
+            print(f"⚠️ Cache warm-up error: {e}")
+        if interval <= 0:
+            return
+        time.sleep(interval)
+
+@st.cache_resource
+def start_cache_warmup():
+    """Start the background warm-up once per server process when CACHE_WARMUP is enabled.
+
+    Streamlit has no process-start hook, so this runs on the first page load.
+    """
+    if os.getenv('CACHE_WARMUP', '').lower() not in ('1', 'true', 'yes'):
+        return None
+    thread = threading.Thread(
+        target=run_cache_warmup,
+        args=(
+            get_admission_controller(),
+            float(os.getenv('WARMUP_INTERVAL', 0)),
+            float(os.getenv('WARMUP_TIME_BUDGET', WARMUP_TIME_BUDGET)),
+            int(os.getenv('WARMUP_NUM_SLIDES', WARMUP_NUM_SLIDES)),
+        ),
+        daemon=True,
+        name="cache-warmup",
+    )
+    thread.start()
+    return thread
+
 def validate_api_setup(content_api, image_api):
     """Validate that selected APIs have proper configuration"""
     errors = []
@@ -299,11 +401,24 @@ def main():
                 elif len(topic_cleaned) > 200:
                     st.error("❌ Topic too long.")
                 else:
-                    # Generate presentation
-                    presentation_data, filename = generate_presentation_with_progress(
-                        topic_cleaned, num_slides, content_api, image_api,
-                        presentation_style, target_audience, include_images, detailed_content
-                    )
+                    # Wait for a free generation slot, then generate presentation
+                    presentation_data, filename = None, None
+                    queue_status = st.empty()
+
+                    def show_queue_position(position):
+                        queue_status.info(f"⏳ Server is busy. You are #{position} in the queue...")
+
+                    try:
+                        user_id, user_limit = get_user_identity()
+                        with get_admission_controller().slot(user_id, on_wait=show_queue_position, limit=user_limit):
+                            queue_status.empty()
+                            presentation_data, filename = generate_presentation_with_progress(
+                                topic_cleaned, num_slides, content_api, image_api,
+                                presentation_style, target_audience, include_images, detailed_content
+                            )
+                    except AdmissionRejected as e:
+                        queue_status.empty()
+                        st.error(f"❌ {e}")
                     
                     if presentation_data and filename:
                         # Display success message
@@ -373,6 +488,11 @@ def display_sidebar_info():
     else:
         st.sidebar.text("No recent presentations")
     
+    running, queued = get_admission_controller().stats()
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### 🚦 Server Load")
+    st.sidebar.text(f"Generating: {running}  |  Queued: {queued}")
+
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 🛠️ Quick Actions")
     
@@ -383,5 +503,6 @@ def display_sidebar_info():
         st.sidebar.info("Run: python setup.py")
 
 if __name__ == "__main__":
+    start_cache_warmup()
     main()
     display_sidebar_info()
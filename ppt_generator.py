@@ -9,6 +9,14 @@ from PIL import Image
 import io
 from dotenv import load_dotenv
 import json
+import re
+import contextlib
+import copy
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
 from pptx.enum.text import MSO_AUTO_SIZE
@@ -27,6 +35,88 @@ DEFAULT_IMAGE_HEIGHT = Inches(1.5)
 DEFAULT_IMAGE_WIDTH = Inches(1.5)   
 DEFAULT_IMAGE_Y_POSITION = Inches(2.5)  # Adjusted position
 DEFAULT_IMAGE_X_POSITION = Inches(3.5)  # Position from right edge
+FANOUT_SLIDE_THRESHOLD = 10  # Decks this large are generated slide-by-slide
+FANOUT_MAX_WORKERS = 4       # Concurrent Gemini calls in fan-out mode
+FANOUT_MAX_RETRIES = 2       # Extra attempts per slide before falling back
+FANOUT_RETRY_BASE_DELAY = 2  # Seconds before the first retry, doubled on each further attempt
+SLIDE_TYPES = ("title", "introduction", "history", "concepts", "applications",
+               "advantages", "disadvantages", "trends", "future", "conclusion")
+SLIDE_TYPE_ALIASES = {
+    "title slide": "title", "intro": "introduction", "overview": "introduction",
+    "background": "history", "timeline": "history", "concept": "concepts",
+    "key concepts": "concepts", "principles": "concepts", "application": "applications",
+    "use cases": "applications", "advantage": "advantages", "benefits": "advantages",
+    "pros": "advantages", "disadvantage": "disadvantages", "limitations": "disadvantages",
+    "challenges": "disadvantages", "cons": "disadvantages", "trend": "trends",
+    "recent developments": "trends", "future prospects": "future", "outlook": "future",
+    "summary": "conclusion", "conclusions": "conclusion",
+}
+OUTLINE_CACHE_MAX_ITEMS = 200
+OUTLINE_CACHE_TTL = float(os.getenv("OUTLINE_CACHE_TTL", 6 * 60 * 60))  # Seconds before a cached outline expires
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_MB", 50)) * 1024 * 1024  # Pexels originals can be several MB each
+WARMUP_NUM_SLIDES = 8         # Matches the default of the web app's slide slider
+WARMUP_TIME_BUDGET = 600      # Seconds a warm-up pass may spend before stopping
+
+
+class LRUCache:
+    """Thread-safe LRU cache bounded by item count and, optionally, total size in bytes.
+
+    Entries older than ``ttl`` seconds, if given, are treated as missing.
+    """
+
+    def __init__(self, max_items=None, max_bytes=None, ttl=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if not self._live(key):
+                return None
+            self._data.move_to_end(key)
+            return self._data[key][0]
+
+    def age(self, key):
+        """Seconds since ``key`` was stored, or None if it is missing or expired"""
+        with self._lock:
+            if not self._live(key):
+                return None
+            return time.monotonic() - self._data[key][2]
+
+    def set(self, key, value):
+        size = len(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._data.pop(key)[1]
+            self._data[key] = (value, size, time.monotonic())
+            self._bytes += size
+            while ((self.max_items is not None and len(self._data) > self.max_items)
+                   or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                _, (_, evicted_size, _) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._live(key)
+
+    def _live(self, key):
+        """Whether ``key`` is present and unexpired, dropping it if expired. Caller holds the lock."""
+        if key not in self._data:
+            return False
+        if self.ttl is not None and time.monotonic() - self._data[key][2] > self.ttl:
+            self._bytes -= self._data.pop(key)[1]
+            return False
+        return True
+
+
+# Shared across generator instances so every session in the process benefits
+OUTLINE_CACHE = LRUCache(max_items=OUTLINE_CACHE_MAX_ITEMS, ttl=OUTLINE_CACHE_TTL)
+IMAGE_CACHE = LRUCache(max_bytes=IMAGE_CACHE_MAX_BYTES)
 
 
 class PPTGenerator:
@@ -42,8 +132,44 @@ class PPTGenerator:
         self.presentation = Presentation()
 
     # ---------- Content Generation ----------
+    def get_outline(self, topic, num_slides=5, fan_out=None, max_workers=FANOUT_MAX_WORKERS, refresh=False):
+        """Return the outline for a topic, serving it from the outline cache when possible.
+
+        With ``refresh``, a new outline is generated even if one is cached.
+        """
+        if fan_out is None:
+            fan_out = num_slides >= FANOUT_SLIDE_THRESHOLD
+        key = self._outline_cache_key(topic, num_slides, fan_out)
+        cached = None if refresh else OUTLINE_CACHE.get(key)
+        if cached is not None:
+            print(f"⚡ Using cached outline for: {topic}")
+            return copy.deepcopy(cached)
+
+        if fan_out:
+            outline, complete = self._generate_content_outline_fanout(topic, num_slides, max_workers)
+        else:
+            outline, complete = self._generate_content_outline(topic, num_slides)
+
+        # Only cache decks where every slide came from the model, never fallback content
+        if complete:
+            OUTLINE_CACHE.set(key, copy.deepcopy(outline))
+        return outline
+
+    def _outline_cache_key(self, topic, num_slides, fan_out=None):
+        if fan_out is None:
+            fan_out = num_slides >= FANOUT_SLIDE_THRESHOLD
+        return (topic.strip().lower(), num_slides, bool(fan_out))
+
     def generate_content_outline(self, topic, num_slides=5):
         """Generate content outline using Gemini"""
+        return self._generate_content_outline(topic, num_slides)[0]
+
+    def _generate_content_outline(self, topic, num_slides):
+        """Single-call outline generation, returning (outline, complete).
+
+        ``complete`` is False when any slide, or the whole deck, fell back to
+        generic content.
+        """
         prompt = f"""
         Create a professional PowerPoint outline on "{topic}" with {num_slides} slides.
         
@@ -90,17 +216,438 @@ class PPTGenerator:
 
         try:
             response = self.model.generate_content(prompt)
-            content = response.text.strip()
-
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                content = content.split("```")[1].strip()
-
-            return json.loads(content)
+            raw_slides, truncated = self._parse_outline(response.text)
         except Exception as e:
             print(f"Error generating content: {e}")
-            return self._get_fallback_outline(topic, num_slides)
+            return self._get_fallback_outline(topic, num_slides), False
+
+        outline, complete = self._repair_outline(topic, raw_slides, num_slides, truncated)
+        if not outline:
+            print("⚠️ No usable slides in response, using fallback outline")
+            return self._get_fallback_outline(topic, num_slides), False
+        return outline, complete
+
+    def _extract_json(self, text):
+        """Strip markdown code fences around a JSON response"""
+        content = text.strip()
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0].strip()
+        elif "```" in content:
+            content = content.split("```")[1].strip()
+        return content
+
+    # ---------- Outline Parsing ----------
+    def _parse_outline(self, text):
+        """Tolerantly parse an outline response, returning (raw_slides, truncated).
+
+        Trailing commas are repaired. A malformed object in the middle of the
+        array is skipped and kept as a placeholder holding only its slide type,
+        so the slides around it keep their positions. ``truncated`` is True
+        only when the response stops mid-array; a cut-off final object is
+        returned as a partial dict holding whatever fields could be recovered.
+        """
+        content = self._extract_json(text)
+
+        try:
+            data = self._load_json(content)
+            if isinstance(data, dict):
+                data = data.get("slides", [data])
+            if isinstance(data, list):
+                return data, False
+        except json.JSONDecodeError:
+            content = self._strip_trailing_commas(content)
+
+        start = content.find("[")
+        if start == -1:
+            raise ValueError("No JSON array found in response")
+
+        decoder = json.JSONDecoder()
+        slides = []
+        pos = start + 1
+        while pos < len(content):
+            while pos < len(content) and content[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(content):
+                break
+            if content[pos] == "]":
+                return slides, False
+            try:
+                obj, pos = decoder.raw_decode(content, pos)
+                slides.append(obj)
+                continue
+            except json.JSONDecodeError:
+                pass
+
+            # Malformed object: resume at the next one if there is one
+            next_object = re.search(r"\}\s*,\s*\{", content[pos:])
+            if next_object:
+                slides.append(self._salvage_partial_slide(content[pos:pos + next_object.start()], ("slide_type",)))
+                pos += next_object.end() - 1
+                continue
+            if re.search(r"\}\s*\]\s*$", content[pos:]):
+                slides.append(self._salvage_partial_slide(content[pos:], ("slide_type",)))
+                return slides, False
+
+            # Cut off inside the last object
+            partial = self._salvage_partial_slide(content[pos:])
+            if partial.get("title"):
+                slides.append(partial)
+            break
+        return slides, True
+
+    def _load_json(self, content):
+        """Parse JSON strictly, repairing trailing commas only if that fails"""
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            return json.loads(self._strip_trailing_commas(content))
+
+    def _strip_trailing_commas(self, content):
+        """Drop commas that directly precede ] or }, leaving quoted strings untouched"""
+        result = []
+        in_string = False
+        escaped = False
+        for i, char in enumerate(content):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == ",":
+                rest = content[i + 1:].lstrip()
+                if rest[:1] in ("]", "}"):
+                    continue
+            result.append(char)
+        return "".join(result)
+
+    def _salvage_partial_slide(self, fragment, fields=("title", "slide_type", "image_description")):
+        """Recover string fields from a truncated or malformed slide object"""
+        partial = {}
+        for field in fields:
+            match = re.search(rf'"{field}"\s*:\s*"((?:[^"\\]|\\.)*)"', fragment)
+            if match:
+                try:
+                    partial[field] = json.loads(f'"{match.group(1)}"')
+                except json.JSONDecodeError:
+                    partial[field] = match.group(1)
+        return partial
+
+    def _validate_slide(self, raw, index):
+        """Check a raw slide against the outline schema and repair common defects.
+
+        Returns a normalized slide dict, or None if no title can be recovered.
+        A slide whose content is missing is returned with ``content`` set to
+        None so the caller can regenerate just that slide.
+        """
+        if not isinstance(raw, dict):
+            return None
+
+        title = raw.get("title")
+        if not isinstance(title, str) or not title.strip():
+            return None
+
+        content = raw.get("content")
+        if isinstance(content, list):
+            content = "\n".join(str(item) for item in content)
+        if not isinstance(content, str) or not content.strip():
+            content = None
+        else:
+            content = content.strip()
+
+        slide_type = self._normalize_slide_type(raw.get("slide_type"))
+        # Title slides drop their content, so only the opening slide may be one
+        if slide_type is None or (slide_type == "title" and index > 0):
+            slide_type = "title" if index == 0 else "concepts"
+
+        image_needed = raw.get("image_needed", False)
+        if isinstance(image_needed, str):
+            image_needed = image_needed.strip().lower() in ("true", "yes", "1")
+
+        image_description = raw.get("image_description") or ""
+
+        return {
+            "title": title.strip(),
+            "content": content,
+            "slide_type": slide_type,
+            "image_needed": bool(image_needed),
+            "image_description": str(image_description).strip(),
+        }
+
+    def _normalize_slide_type(self, value):
+        """Map a model-supplied slide type onto SLIDE_TYPES, or None if unrecognised"""
+        slide_type = " ".join(re.findall(r"[a-z]+", str(value or "").lower()))
+        if slide_type in SLIDE_TYPES:
+            return slide_type
+        if slide_type in SLIDE_TYPE_ALIASES:
+            return SLIDE_TYPE_ALIASES[slide_type]
+        # Whole words only, in the order they appear ("subtitle" must not match "title")
+        for word in slide_type.split():
+            if word in SLIDE_TYPES:
+                return word
+            if word in SLIDE_TYPE_ALIASES:
+                return SLIDE_TYPE_ALIASES[word]
+        return None
+
+    def _repair_outline(self, topic, raw_slides, num_slides, truncated=False):
+        """Keep every valid slide, regenerate broken ones in place and fill in a truncated tail.
+
+        Returns (slides, complete), where ``complete`` is False if any slide
+        ended up with fallback content or had to be dropped.
+        """
+        complete = True
+        slides = []
+        for raw in raw_slides:
+            slide = self._validate_slide(raw, len(slides))
+            slides.append(slide if slide is not None else self._placeholder_slide(raw, len(slides)))
+
+        untitled = [i for i, slide in enumerate(slides) if slide["title"] is None]
+        if untitled:
+            print(f"🔧 Recovering titles for {len(untitled)} broken slide(s)")
+            titles = self._generate_missing_titles(topic, slides)
+            if titles:
+                for i, title in zip(untitled, titles):
+                    slides[i]["title"] = title
+            else:
+                complete = False
+                slides = [slide for slide in slides if slide["title"] is not None]
+
+        if truncated and slides and len(slides) < num_slides:
+            print(f"🔧 Response stopped after {len(slides)} slides, generating {num_slides - len(slides)} more")
+            slides = self._extend_skeleton(topic, slides, num_slides)
+            if slides[-1]["slide_type"] != "conclusion" and len(slides) > 1:
+                complete = False
+                conclusion = self._get_fallback_outline(topic, num_slides)[-1]
+                conclusion["content"] = None
+                if len(slides) >= num_slides:
+                    slides[-1] = conclusion
+                else:
+                    slides.append(conclusion)
+
+        for i, slide in enumerate(slides):
+            if slide["content"] is None and not self._is_title_slide(i, slide["slide_type"]):
+                print(f"🔧 Regenerating content for slide {i+1}: {slide['title']}")
+        slides, filled = self._fill_slides(topic, slides)
+        return slides, complete and filled
+
+    def _placeholder_slide(self, raw, index):
+        """Stand-in for a slide without a usable title, keeping its position and any valid fields"""
+        slide = self._validate_slide({**raw, "title": "untitled"} if isinstance(raw, dict) else {"title": "untitled"}, index)
+        slide["title"] = None
+        return slide
+
+    def _generate_missing_titles(self, topic, slides, max_retries=FANOUT_MAX_RETRIES):
+        """Ask for titles for the untitled slides, given their neighbours.
+
+        Returns a list with one title per untitled slide in deck order, or
+        None if no valid answer was produced.
+        """
+        missing = sum(1 for slide in slides if slide["title"] is None)
+        slide_list = "\n".join(
+            f"        {i + 1}. {slide['title'] or '[MISSING]'} ({slide['slide_type']})"
+            for i, slide in enumerate(slides)
+        )
+        prompt = f"""
+        A PowerPoint presentation on "{topic}" has these slides, where [MISSING] marks a slide without a title:
+{slide_list}
+
+        Suggest a title for each [MISSING] slide that fits between its neighbours and does not repeat another slide.
+        Return ONLY a JSON array of {missing} title strings, in slide order.
+        """
+        for attempt in range(max_retries + 1):
+            try:
+                response = self.model.generate_content(prompt)
+                titles = self._load_json(self._extract_json(response.text))
+                if (not isinstance(titles, list) or len(titles) != missing
+                        or not all(isinstance(title, str) and title.strip() for title in titles)):
+                    raise ValueError("Expected one title per missing slide")
+                return [title.strip() for title in titles]
+            except Exception as e:
+                print(f"⚠️ Title recovery attempt {attempt + 1} failed: {e}")
+                if attempt < max_retries:
+                    self._backoff(attempt)
+        return None
+
+    def generate_content_outline_fanout(self, topic, num_slides=5,
+                                        max_workers=FANOUT_MAX_WORKERS, max_retries=FANOUT_MAX_RETRIES):
+        """Generate the outline as a compact skeleton, then fill each slide in parallel"""
+        return self._generate_content_outline_fanout(topic, num_slides, max_workers, max_retries)[0]
+
+    def _generate_content_outline_fanout(self, topic, num_slides, max_workers=FANOUT_MAX_WORKERS,
+                                         max_retries=FANOUT_MAX_RETRIES):
+        """Fan-out outline generation, returning (outline, complete)"""
+        skeleton = self._generate_outline_skeleton(topic, num_slides, max_retries=max_retries)
+        if not skeleton:
+            return self._get_fallback_outline(topic, num_slides), False
+        if len(skeleton) < num_slides:
+            print(f"🔧 Skeleton has {len(skeleton)} of {num_slides} slides, requesting the rest")
+            skeleton = self._extend_skeleton(topic, skeleton, num_slides, max_retries)
+
+        slides, complete = self._fill_slides(topic, skeleton, max_workers, max_retries)
+        return slides, complete and len(slides) >= num_slides
+
+    def _fill_slides(self, topic, slides, max_workers=FANOUT_MAX_WORKERS, max_retries=FANOUT_MAX_RETRIES):
+        """Generate content in parallel for every slide whose content is None.
+
+        Returns (slides, complete), where ``complete`` is False if any slide
+        ended up with fallback content.
+        """
+        slides = list(slides)
+        titles = [slide["title"] for slide in slides]
+        pending = [i for i, slide in enumerate(slides) if slide["content"] is None]
+
+        def fill(index):
+            return self._generate_slide_content(topic, slides[index], index, titles, max_retries)
+
+        # map() preserves input order, so results line up with pending
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fill, pending))
+        for index, (slide, _) in zip(pending, results):
+            slides[index] = slide
+        return slides, all(from_model for _, from_model in results)
+
+    def _extend_skeleton(self, topic, slides, num_slides, max_retries=FANOUT_MAX_RETRIES):
+        """Request the slides missing from a short deck, keeping a closing conclusion last"""
+        missing = num_slides - len(slides)
+        if missing <= 0 or not slides:
+            return slides
+        closing = slides[-1] if slides[-1]["slide_type"] == "conclusion" and len(slides) > 1 else None
+        body = slides[:-1] if closing else slides
+        extra = self._generate_outline_skeleton(
+            topic, missing, [slide["title"] for slide in body],
+            closing_title=closing["title"] if closing else None, max_retries=max_retries,
+        )
+        return body + extra + ([closing] if closing else [])
+
+    def _generate_outline_skeleton(self, topic, num_slides, existing_titles=None, closing_title=None,
+                                   max_retries=FANOUT_MAX_RETRIES):
+        """Fetch slide titles and types only, without bullet content.
+
+        With ``existing_titles``, only the ``num_slides`` slides that follow
+        them are requested, so a short deck can be continued. With
+        ``closing_title`` as well, the new slides go before that closing slide.
+        May return fewer than ``num_slides`` slides, or none if every attempt fails.
+        """
+        existing_titles = existing_titles or []
+        if existing_titles:
+            slide_list = "\n".join(f"        {i + 1}. {title}" for i, title in enumerate(existing_titles))
+            if closing_title:
+                task = f"""It closes with the slide "{closing_title}".
+        Create the {num_slides} slides that go between them. Do not repeat existing slides
+        and do not add another conclusion."""
+            else:
+                task = f"""Create the next {num_slides} slides to complete it. Do not repeat existing slides,
+        and make the last slide a conclusion."""
+            intro = f"""A PowerPoint presentation on "{topic}" already has these slides:
+{slide_list}
+
+        {task}"""
+        else:
+            intro = f"""Create the slide list for a professional PowerPoint presentation on "{topic}" with {num_slides} slides.
+        Start with a title slide and end with a conclusion, following a logical flow
+        (introduction, history, concepts, applications, advantages, disadvantages, trends, future)."""
+        prompt = f"""
+        {intro}
+
+        Return ONLY a JSON array with exactly {num_slides} objects of this structure:
+        [
+            {{
+                "title": "Slide Title",
+                "slide_type": "title|introduction|history|concepts|applications|advantages|disadvantages|trends|future|conclusion",
+                "image_needed": true/false,
+                "image_description": "Specific image description for this slide"
+            }}
+        ]
+        """
+        for attempt in range(max_retries + 1):
+            try:
+                response = self.model.generate_content(prompt)
+                skeleton = []
+                raw_slides, _ = self._parse_outline(response.text)
+                for raw in raw_slides:
+                    slide = self._validate_slide(raw, len(existing_titles) + len(skeleton))
+                    if slide is not None:
+                        skeleton.append(slide)
+                if not skeleton:
+                    raise ValueError("No usable slides in skeleton")
+                return skeleton[:num_slides]
+            except Exception as e:
+                print(f"Error generating outline skeleton (attempt {attempt + 1}): {e}")
+                if attempt < max_retries:
+                    self._backoff(attempt)
+        return []
+
+    def _backoff(self, attempt):
+        """Sleep before a retry: exponential in the attempt number, plus jitter"""
+        delay = FANOUT_RETRY_BASE_DELAY * 2 ** attempt
+        time.sleep(delay + random.uniform(0, delay))
+
+    def _generate_slide_content(self, topic, slide, index, titles, max_retries=FANOUT_MAX_RETRIES):
+        """Generate detailed bullets for one slide, retrying only this slide on failure.
+
+        ``titles`` is the full list of slide titles, so each call knows what the
+        other slides cover. Retries back off exponentially with jitter.
+        Returns (slide, from_model); from_model is False if fallback bullets were used.
+        """
+        slide_type = slide.get("slide_type", "concepts")
+        result = {
+            "title": slide["title"],
+            "slide_type": slide_type,
+            "image_needed": bool(slide.get("image_needed", False)),
+            "image_description": slide.get("image_description", ""),
+        }
+        # create_title_slide ignores content, so don't spend a call on it
+        if self._is_title_slide(index, slide_type):
+            result["content"] = slide.get("content") or ""
+            return result, True
+
+        slide_list = "\n".join(f"        {i + 1}. {title}" for i, title in enumerate(titles))
+        prompt = f"""
+        You are writing slide {index + 1} of {len(titles)} in a presentation on "{topic}".
+        Slide title: "{slide['title']}"
+        Slide type: {slide_type}
+
+        The full slide list is:
+{slide_list}
+
+        Cover only what belongs on this slide. Do not repeat points that fit better under another slide's title.
+
+        Return ONLY a JSON object of this structure:
+        {{
+            "content": "• First detailed bullet point with explanation\n• Second detailed bullet point with explanation\n• Third detailed bullet point with explanation\n• Fourth detailed bullet point with explanation"
+        }}
+
+        CRITICAL REQUIREMENTS:
+        - Each bullet point should be 1-2 sentences explaining the concept
+        - Include specific facts, examples, and details for each bullet point
+        - Use bullet points (•) format
+        """
+        for attempt in range(max_retries + 1):
+            try:
+                response = self.model.generate_content(prompt)
+                data = self._load_json(self._extract_json(response.text))
+                checked = self._validate_slide({"title": slide["title"], "content": data.get("content")}, index)
+                if checked["content"] is None:
+                    raise ValueError("Empty slide content")
+                result["content"] = checked["content"]
+                return result, True
+            except Exception as e:
+                print(f"⚠️ Slide {index + 1} attempt {attempt + 1} failed: {e}")
+                if attempt < max_retries:
+                    self._backoff(attempt)
+
+        result["content"] = self._get_fallback_content(topic, slide_type)
+        return result, False
+
+    def _get_fallback_content(self, topic, slide_type):
+        """Fallback bullets for a single slide, matched by slide type"""
+        for fallback in self._get_fallback_outline(topic, 1):
+            if fallback["slide_type"] == slide_type:
+                return fallback["content"]
+        return self._get_fallback_outline(topic, 1)[0]["content"]
 
     def _get_fallback_outline(self, topic, num_slides):
         """Fallback outline if Gemini fails"""
@@ -191,34 +738,48 @@ class PPTGenerator:
     def download_image(self, query, save_path="temp_image.jpg"):
         """Download an image from Pexels API"""
         try:
-            pexels_api_key = os.getenv('PEXELS_API_KEY')
-            if not pexels_api_key:
-                print("⚠️ No Pexels API key found, using placeholder")
+            image_data = self._fetch_image(query)
+            if image_data is None:
                 return self._create_placeholder(save_path)
 
-            url = "https://api.pexels.com/v1/search"
-            headers = {"Authorization": pexels_api_key}
-            params = {"query": query, "per_page": 1, "orientation": "landscape"}
-
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            data = response.json()
-
-            if not data.get("photos"):
-                return self._create_placeholder(save_path)
-
-            image_url = data["photos"][0]["src"]["original"]
-            img_response = requests.get(image_url)
-            img_response.raise_for_status()
-
             with open(save_path, "wb") as f:
-                f.write(img_response.content)
+                f.write(image_data)
 
             return save_path
         except Exception as e:
             print(f"⚠️ Image download error: {e}")
             return self._create_placeholder(save_path)
 
+    def _fetch_image(self, query):
+        """Return image bytes for a query from the image cache or Pexels, or None if unavailable"""
+        key = query.strip().lower()
+        cached = IMAGE_CACHE.get(key)
+        if cached is not None:
+            return cached
+
+        pexels_api_key = os.getenv('PEXELS_API_KEY')
+        if not pexels_api_key:
+            print("⚠️ No Pexels API key found, using placeholder")
+            return None
+
+        url = "https://api.pexels.com/v1/search"
+        headers = {"Authorization": pexels_api_key}
+        params = {"query": query, "per_page": 1, "orientation": "landscape"}
+
+        response = requests.get(url, headers=headers, params=params)
+        response.raise_for_status()
+        data = response.json()
+
+        if not data.get("photos"):
+            return None
+
+        image_url = data["photos"][0]["src"]["original"]
+        img_response = requests.get(image_url)
+        img_response.raise_for_status()
+
+        IMAGE_CACHE.set(key, img_response.content)
+        return img_response.content
+
     def _create_placeholder(self, save_path):
         """Fallback placeholder image"""
         img = Image.new("RGB", (800, 600), color="#4A90E2")
@@ -271,31 +832,44 @@ class PPTGenerator:
             p.font.color.rgb = DEFAULT_TEXT_COLOR
 
     # ---------- Presentation Generator ----------
-    def generate_presentation(self, topic, num_slides=5, output_path="generated_presentation.pptx"):
+    def _is_title_slide(self, index, slide_type):
+        """Whether a slide is rendered by create_title_slide, which shows no content"""
+        return index == 0 or slide_type == "title"
+
+    def _is_comparison_slide(self, slide_type):
+        return slide_type in ["advantages", "disadvantages"]
+
+    def _slide_needs_image(self, index, slide_data):
+        """Whether generate_presentation will place an image on this slide"""
+        slide_type = slide_data.get("slide_type")
+        if self._is_title_slide(index, slide_type) or self._is_comparison_slide(slide_type):
+            return False
+        return bool(slide_data.get("image_needed", False))
+
+    def generate_presentation(self, topic, num_slides=5, output_path="generated_presentation.pptx", fan_out=None):
         if not topic.strip():
             raise ValueError("Topic cannot be empty")
         if num_slides < 1 or num_slides > 20:
             raise ValueError("Slides must be between 1 and 20")
 
         print(f"📊 Generating presentation on: {topic}")
-        outline = self.generate_content_outline(topic, num_slides)
+        outline = self.get_outline(topic, num_slides, fan_out)
 
         for i, slide_data in enumerate(outline):
             title = slide_data["title"]
             content = slide_data["content"]
             slide_type = slide_data["slide_type"]
-            image_needed = slide_data.get("image_needed", False)
             image_description = slide_data.get("image_description", "")
 
             print(f"➡️ Creating slide {i+1}: {title}")
 
-            if i == 0 or slide_type == "title":
+            if self._is_title_slide(i, slide_type):
                 self.create_title_slide(title, "Generated by Gemini AI")
-            elif slide_type in ["advantages", "disadvantages"]:
+            elif self._is_comparison_slide(slide_type):
                 self.create_comparison_slide(title, content)
             else:
                 image_path = None
-                if image_needed:
+                if self._slide_needs_image(i, slide_data):
                     query = image_description if image_description else self.generate_image_description(content)
                     image_path = self.download_image(query)
                 self.create_content_slide(title, content, image_path)
@@ -304,6 +878,52 @@ class PPTGenerator:
         print(f"✅ Presentation saved as: {output_path}")
         return output_path
     
+    # ---------- Cache Warm-up ----------
+    def warm_up(self, topics, num_slides=WARMUP_NUM_SLIDES, time_budget=WARMUP_TIME_BUDGET, slot=None,
+                refresh_age=None):
+        """Pre-generate outlines and pre-fetch images for hot topics into the caches.
+
+        Topics already cached are skipped unless their outline is older than
+        ``refresh_age`` seconds, in which case it is regenerated.
+        Stops starting new topics once ``time_budget`` seconds have elapsed.
+        ``slot`` is an optional callable returning a context manager that is
+        held while each topic is generated, so warm-up can share the web app's
+        concurrency limit. Slides are generated one at a time even in fan-out
+        mode. Returns the number of topics that were generated cold.
+        """
+        deadline = time.monotonic() + time_budget
+        warmed = 0
+        for topic in topics:
+            if time.monotonic() >= deadline:
+                print("⏱️ Warm-up budget exhausted, stopping")
+                break
+            age = OUTLINE_CACHE.age(self._outline_cache_key(topic, num_slides))
+            if age is not None and (refresh_age is None or age < refresh_age):
+                continue
+
+            try:
+                with slot() if slot else contextlib.nullcontext():
+                    # Waiting for the slot may have used up the budget
+                    if time.monotonic() >= deadline:
+                        print("⏱️ Warm-up budget exhausted, stopping")
+                        break
+                    print(f"🔥 Warming cache for: {topic}")
+                    self._warm_topic(topic, num_slides, deadline, refresh=age is not None)
+                warmed += 1
+            except Exception as e:
+                print(f"⚠️ Warm-up failed for {topic}: {e}")
+        return warmed
+
+    def _warm_topic(self, topic, num_slides, deadline, refresh=False):
+        """Generate one topic's outline serially and pre-fetch its images"""
+        outline = self.get_outline(topic, num_slides, max_workers=1, refresh=refresh)
+        for i, slide_data in enumerate(outline):
+            if time.monotonic() >= deadline:
+                break
+            # Queries generated on the fly at build time would not match, so only described images
+            if self._slide_needs_image(i, slide_data) and slide_data.get("image_description"):
+                self._fetch_image(slide_data["image_description"])
+
     def create_universal_slide(self, title, content, image_path=None):
         slide_layout = self.presentation.slide_layouts[6]
         slide = self.presentation.slides.add_slide(slide_layout)